@@ -4,9 +4,19 @@ This script processes all template queries and converts them to executable SQL s
 """
 
 import pandas as pd
+import argparse
+import hashlib
 import json
+import os
 import re
-from typing import Dict, List, Any
+import tempfile
+import time
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from multiprocessing import Pool
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 import src.nostros.config as config
 
 from src.nostros.sql_processing import render_template_query
@@ -16,7 +26,24 @@ from src.nostros.rendering_functions import (
     render_drug_template,
 )
 
-from src.nostros.config import get_db_connection
+from src.nostros.config import pooled_db_connection
+
+# Argument placeholders: <ARG-TYPE><INDEX>. Template-based placeholders
+# (<TEMPLATE><ARG-TYPE><INDEX>) always end in one of these, so this also covers them.
+_ARG_RE = re.compile(r'<ARG-(\w+)><(\d+)>')
+
+# Minimum number of distinct templates per render process before rendering is parallelized
+RENDER_TEMPLATES_PER_WORKER = 500
+
+
+class RenderResult(NamedTuple):
+    """Outcome of rendering a single query template."""
+    query_id: int
+    original_template: str
+    rendered_query: Optional[str]
+    required_args: Optional[Dict[str, int]]
+    status: str
+    error: Optional[str] = None
 
 
 def create_sample_args_dict() -> Dict[str, List[Dict[str, Any]]]:
@@ -78,96 +105,196 @@ def create_sample_args_dict() -> Dict[str, List[Dict[str, Any]]]:
     }
 
 
-def create_sample_args_dict_from_db(conn):
-    """
-    Fetch concept codes for drugs, conditions, race, gender, ethnicity,
-    states, timeyears, and age from the OMOP DB and return a dictionary
-    structured for use with template rendering.
-    """
-    def fetch_codes(query):
-        with conn.cursor() as cur:
-            cur.execute(query)
-            return [row[0] for row in cur.fetchall()]
-
-    def wrap_query_args(codes):
-        return [{"Query-arg": str(code)} for code in codes if code is not None]
-
-    drug_codes = fetch_codes("""
+# Vocabulary and number of standard concept codes sampled for each concept argument type
+CONCEPT_ARG_VOCABULARIES = {
+    "DRUG": ("RxNorm", 50),
+    "CONDITION": ("ICD10CM", 50),
+    "RACE": ("Race", 20),
+    "GENDER": ("Gender", 10),
+    "ETHNICITY": ("Ethnicity", 10),
+}
+
+# Standard concept codes of several vocabularies in one round-trip, parameterized by
+# parallel (vocabulary_ids, limits) arrays. LATERAL keeps the per-vocabulary LIMIT.
+CONCEPT_CODES_QUERY = """
+    SELECT v.vocabulary_id, c.concept_code
+    FROM unnest(%s::text[], %s::int[]) AS v(vocabulary_id, max_rows)
+    CROSS JOIN LATERAL (
         SELECT concept_code
         FROM concept
-        WHERE vocabulary_id = 'RxNorm'
+        WHERE concept.vocabulary_id = v.vocabulary_id
           AND standard_concept = 'S'
-        LIMIT 50
-    """)
-
-    condition_codes = fetch_codes("""
-        SELECT concept_code
-        FROM concept
-        WHERE vocabulary_id = 'ICD10CM'
-          AND standard_concept = 'S'
-        LIMIT 50
-    """)
-
-    race_codes = fetch_codes("""
-        SELECT concept_code
-        FROM concept
-        WHERE vocabulary_id = 'Race'
-          AND standard_concept = 'S'
-        LIMIT 20
-    """)
-
-    gender_codes = fetch_codes("""
-        SELECT concept_code
-        FROM concept
-        WHERE vocabulary_id = 'Gender'
-          AND standard_concept = 'S'
-        LIMIT 10
-    """)
-
-    ethnicity_codes = fetch_codes("""
-        SELECT concept_code
-        FROM concept
-        WHERE vocabulary_id = 'Ethnicity'
-          AND standard_concept = 'S'
-        LIMIT 10
-    """)
+        LIMIT v.max_rows
+    ) c
+"""
 
-    state_names = fetch_codes("""
+# Other queries used to sample argument values from the OMOP DB, keyed by argument type.
+# Each entry is a (query, params) pair.
+SAMPLE_ARGS_QUERIES = {
+    "STATE": ("""
         SELECT DISTINCT location.state
         FROM location
         WHERE location.state IS NOT NULL
-        LIMIT 20
-    """)
-
-    years = fetch_codes("""
+        LIMIT %s
+    """, (20,)),
+    "TIMEYEARS": ("""
         SELECT DISTINCT EXTRACT(YEAR FROM observation_period_start_date)::INT AS year
         FROM observation_period
         ORDER BY year DESC
-        LIMIT 20
-    """)
-
-    ages = fetch_codes("""
+        LIMIT %s
+    """, (20,)),
+    "AGE": ("""
         SELECT DISTINCT EXTRACT(YEAR FROM CURRENT_DATE) - year_of_birth AS age
         FROM person
         WHERE year_of_birth IS NOT NULL
         ORDER BY age
-        LIMIT 20
-    """)
+        LIMIT %s
+    """, (20,)),
+}
 
-    # Optional: static values for TIMEDAYS if not in DB
-    timedays = [30, 90, 180, 365]
+# Static values for TIMEDAYS, which are not sampled from the DB
+TIMEDAYS_ARGS = [{"Query-arg": str(days)} for days in (30, 90, 180, 365)]
 
-    return {
-        "DRUG": wrap_query_args(drug_codes),
-        "CONDITION": wrap_query_args(condition_codes),
-        "RACE": wrap_query_args(race_codes),
-        "GENDER": wrap_query_args(gender_codes),
-        "ETHNICITY": wrap_query_args(ethnicity_codes),
-        "STATE": wrap_query_args(state_names),
-        "TIMEYEARS": wrap_query_args([int(y) for y in years]),
-        "AGE": wrap_query_args([int(a) for a in ages]),
-        "TIMEDAYS": wrap_query_args(timedays),
-    }
+# On-disk snapshot of the DB-sampled arguments, reused across runs while it is fresh.
+# Pass refresh=True to create_sample_args_dict_from_db (--refresh-sample-args) to bypass it.
+SAMPLE_ARGS_CACHE_FILE = os.path.join("cache", "sample_args.json")
+SAMPLE_ARGS_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+
+# Sample arguments fetched from the DB, shared by every process_queries call
+_sample_args_cache = None
+_sample_args_lock = threading.Lock()
+
+
+def _sample_args_cache_key() -> str:
+    """
+    Identifies the database and lookups a sample arguments snapshot was taken with.
+    """
+    lookups = [os.getenv("DB_CONNECTION_STRING"), CONCEPT_ARG_VOCABULARIES, SAMPLE_ARGS_QUERIES]
+    return hashlib.sha256(json.dumps(lookups).encode('utf-8')).hexdigest()
+
+
+def _load_sample_args_snapshot(key: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Returns the sample arguments stored on disk, or None if missing, stale, malformed
+    or taken with other lookups.
+    """
+    try:
+        if time.time() - os.path.getmtime(SAMPLE_ARGS_CACHE_FILE) > SAMPLE_ARGS_CACHE_MAX_AGE:
+            return None
+        with open(SAMPLE_ARGS_CACHE_FILE, 'rb') as f:
+            snapshot = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    if not isinstance(snapshot, dict) or snapshot.get('key') != key:
+        return None
+    sample_args = snapshot.get('sample_args')
+    if not isinstance(sample_args, dict):
+        return None
+    
+    # Every DB-sampled type must be present as a list of {"Query-arg": str} dicts
+    for arg_type in (*CONCEPT_ARG_VOCABULARIES, *SAMPLE_ARGS_QUERIES):
+        values = sample_args.get(arg_type)
+        if not isinstance(values, list):
+            return None
+        for value in values:
+            if not isinstance(value, dict) or not isinstance(value.get("Query-arg"), str):
+                return None
+    return sample_args
+
+
+def _save_sample_args_snapshot(key: str, sample_args: Dict[str, List[Dict[str, Any]]]):
+    """
+    Stores the sample arguments on disk for later runs. The snapshot is only a cache,
+    so failures are reported and otherwise ignored. The file is written to a temporary
+    path and renamed into place, so readers never see a partial snapshot.
+    """
+    data = json.dumps({'key': key, 'sample_args': sample_args}).encode('utf-8')
+    cache_dir = os.path.dirname(SAMPLE_ARGS_CACHE_FILE)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, SAMPLE_ARGS_CACHE_FILE)
+        except OSError:
+            os.remove(tmp_file)
+            raise
+    except OSError as e:
+        print(f"Warning: Could not save sample arguments snapshot to '{SAMPLE_ARGS_CACHE_FILE}': {e}")
+
+
+def create_sample_args_dict_from_db(refresh: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch concept codes for drugs, conditions, race, gender, ethnicity,
+    states, timeyears, and age from the OMOP DB and return a dictionary
+    structured for use with template rendering.
+
+    The concept codes of all vocabularies come from a single query. It and the
+    remaining lookups are independent, so each one runs on its own pooled
+    connection in a thread pool. The result is fetched once per process and
+    reused afterwards; it is also snapshotted to SAMPLE_ARGS_CACHE_FILE so runs
+    within SAMPLE_ARGS_CACHE_MAX_AGE skip the DB entirely. The static TIMEDAYS
+    values are never snapshotted; they are merged in after loading.
+
+    Args:
+        refresh: Ignore the in-memory and on-disk caches and fetch from the DB again
+    """
+    global _sample_args_cache
+
+    def fetch_rows(query, params):
+        with pooled_db_connection() as conn:
+            # Server-side cursor: rows are streamed in batches instead of fetched all at once
+            with conn.cursor(name="sample_args") as cur:
+                cur.itersize = 1000
+                cur.execute(query, params)
+                return list(cur)
+
+    def wrap_query_args(codes):
+        return [{"Query-arg": str(code)} for code in codes if code is not None]
+
+    with _sample_args_lock:
+        if _sample_args_cache is not None and not refresh:
+            return _sample_args_cache
+
+        cache_key = _sample_args_cache_key()
+        sampled_args = None if refresh else _load_sample_args_snapshot(cache_key)
+        if sampled_args is not None:
+            _sample_args_cache = {**sampled_args, "TIMEDAYS": TIMEDAYS_ARGS}
+            return _sample_args_cache
+
+        vocabularies = [vocab for vocab, _ in CONCEPT_ARG_VOCABULARIES.values()]
+        limits = [limit for _, limit in CONCEPT_ARG_VOCABULARIES.values()]
+
+        with ThreadPoolExecutor(max_workers=len(SAMPLE_ARGS_QUERIES) + 1) as executor:
+            concept_future = executor.submit(fetch_rows, CONCEPT_CODES_QUERY, (vocabularies, limits))
+            futures = {
+                executor.submit(fetch_rows, query, params): arg_type
+                for arg_type, (query, params) in SAMPLE_ARGS_QUERIES.items()
+            }
+            codes = {futures[future]: [row[0] for row in future.result()] for future in as_completed(futures)}
+
+            concept_codes = {vocab: [] for vocab in vocabularies}
+            for vocabulary_id, concept_code in concept_future.result():
+                concept_codes[vocabulary_id].append(concept_code)
+
+        for arg_type, (vocab, _) in CONCEPT_ARG_VOCABULARIES.items():
+            codes[arg_type] = concept_codes[vocab]
+
+        sampled_args = {
+            "DRUG": wrap_query_args(codes["DRUG"]),
+            "CONDITION": wrap_query_args(codes["CONDITION"]),
+            "RACE": wrap_query_args(codes["RACE"]),
+            "GENDER": wrap_query_args(codes["GENDER"]),
+            "ETHNICITY": wrap_query_args(codes["ETHNICITY"]),
+            "STATE": wrap_query_args(codes["STATE"]),
+            "TIMEYEARS": wrap_query_args([int(y) for y in codes["TIMEYEARS"]]),
+            "AGE": wrap_query_args([int(a) for a in codes["AGE"]]),
+        }
+        _save_sample_args_snapshot(cache_key, sampled_args)
+        _sample_args_cache = {**sampled_args, "TIMEDAYS": TIMEDAYS_ARGS}
+        return _sample_args_cache
 
 
 def identify_required_args(query: str) -> Dict[str, int]:
@@ -180,45 +307,58 @@ def identify_required_args(query: str) -> Dict[str, int]:
     Returns:
         Dictionary mapping argument types to their maximum index + 1
     """
-    required_args = {}
+    return dict(_scan_required_args(query))
+
+
+@lru_cache(maxsize=4096)
+def _scan_required_args(query: str) -> Tuple[Tuple[str, int], ...]:
+    """
+    Scans a query template for placeholders. Results are cached per template string,
+    so they are returned as an immutable tuple of (argument type, count) pairs.
+    """
+    placeholder_count = query.count('<ARG-')
     
-    # Find template-based placeholders: <TEMPLATE><ARG-TYPE><INDEX>
-    template_pattern = r'<(\w+)-TEMPLATE><ARG-(\w+)><(\d+)>'
-    template_matches = re.findall(template_pattern, query)
+    # Literal SQL (or SQL that only uses "<" as an operator) has nothing to scan
+    if placeholder_count == 0:
+        return ()
     
-    for template_type, arg_type, index in template_matches:
-        idx = int(index)
-        if arg_type not in required_args:
-            required_args[arg_type] = idx + 1
-        else:
-            required_args[arg_type] = max(required_args[arg_type], idx + 1)
+    # A single placeholder only needs an anchored match at its position
+    if placeholder_count == 1:
+        match = _ARG_RE.match(query, query.find('<ARG-'))
+        if match is None:
+            return ()
+        arg_type, index = match.groups()
+        return ((arg_type, int(index) + 1),)
+    
+    required_args = defaultdict(int)
     
-    # Find argument-only placeholders: <ARG-TYPE><INDEX>
-    arg_pattern = r'<ARG-(\w+)><(\d+)>'
-    arg_matches = re.findall(arg_pattern, query)
+    # Find argument placeholders, both template-based and argument-only
+    arg_matches = _ARG_RE.findall(query)
     
     for arg_type, index in arg_matches:
-        idx = int(index)
-        if arg_type not in required_args:
-            required_args[arg_type] = idx + 1
-        else:
-            required_args[arg_type] = max(required_args[arg_type], idx + 1)
+        count = int(index) + 1
+        if count > required_args[arg_type]:
+            required_args[arg_type] = count
     
-    return required_args
+    return tuple(required_args.items())
 
 
-def create_args_dict_for_query(query: str, sample_args: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+def create_args_dict_for_query(
+    required_args: Dict[str, int],
+    sample_args: Dict[str, List[Dict[str, Any]]],
+    warnings: Optional[List[str]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
     """
     Creates an arguments dictionary tailored for a specific query.
     
     Args:
-        query: SQL template query string
+        required_args: Required arguments of the query, as returned by identify_required_args
         sample_args: Complete sample arguments dictionary
+        warnings: If given, warnings are appended to it instead of printed
         
     Returns:
         Arguments dictionary with only the required arguments for this query
     """
-    required_args = identify_required_args(query)
     query_args = {}
     
     for arg_type, count in required_args.items():
@@ -226,31 +366,79 @@ def create_args_dict_for_query(query: str, sample_args: Dict[str, List[Dict[str,
             # Take only the required number of arguments
             query_args[arg_type] = sample_args[arg_type][:count]
         else:
-            print(f"Warning: Missing sample data for argument type '{arg_type}'")
+            warning = f"Warning: Missing sample data for argument type '{arg_type}'"
+            if warnings is None:
+                print(warning)
+            else:
+                warnings.append(warning)
             # Create placeholder arguments
             query_args[arg_type] = [{"Query-arg": f"PLACEHOLDER_{i}"} for i in range(count)]
     
     return query_args
 
 
-def process_queries(csv_file: str, output_file: str = "rendered_queries.sql"):
+def _render_one(
+    query_template: str,
+    sample_args: Dict[str, List[Dict[str, Any]]],
+) -> Tuple[Optional[str], Optional[str], Dict[str, int], List[str]]:
+    """
+    Renders a single query template. Kept at module level so it can run in worker processes.
+    
+    Args:
+        query_template: SQL template query string
+        sample_args: Complete sample arguments dictionary
+        
+    Returns:
+        Tuple of (rendered query, error message, required arguments, warnings); exactly one of
+        the first two is None. Required arguments are returned so the caller does not rescan the
+        template, and warnings so they can be logged with their query.
+    """
+    warnings = []
+    required_args = {}
+    try:
+        required_args = identify_required_args(query_template)
+        
+        # Create arguments dictionary for this specific query
+        query_args = create_args_dict_for_query(required_args, sample_args, warnings)
+        
+        # Render the query
+        return render_template_query(config, query_template, query_args), None, required_args, warnings
+    except Exception as e:
+        return None, str(e), required_args, warnings
+
+
+def default_render_workers(template_count: int) -> int:
+    """
+    Picks the number of render processes: one per CPU, but only as many as there are
+    batches of RENDER_TEMPLATES_PER_WORKER templates, so small inputs stay in-process.
+    """
+    return max(1, min(os.cpu_count() or 1, template_count // RENDER_TEMPLATES_PER_WORKER))
+
+
+def process_queries(
+    csv_file: str,
+    output_file: str = "rendered_queries.sql",
+    workers: Optional[int] = None,
+    refresh_sample_args: bool = False,
+):
     """
     Processes all queries from the CSV file and renders them into proper SQL.
     
     Args:
         csv_file: Path to the CSV file containing query templates
         output_file: Path to output file for rendered SQL queries
+        workers: Number of processes used to render templates (1 renders in-process).
+            Defaults to default_render_workers for the number of distinct templates.
+        refresh_sample_args: Fetch the sample arguments from the DB even if a fresh snapshot exists
     """
 
-    conn = get_db_connection()
-
     try:
-        # Read the CSV file
-        df = pd.read_csv(csv_file)
+        # Read the CSV file; only the query column is used
+        df = pd.read_csv(csv_file, usecols=['query'], dtype={'query': str}, engine='c')
         print(f"Loaded {len(df)} queries from {csv_file}")
         
         # Create sample arguments
-        sample_args = create_sample_args_dict_from_db(conn)
+        sample_args = create_sample_args_dict_from_db(refresh=refresh_sample_args)
         # sample_args = create_sample_args_dict()
 
         print(sample_args)
@@ -259,39 +447,50 @@ def process_queries(csv_file: str, output_file: str = "rendered_queries.sql"):
         successful_renders = 0
         failed_renders = 0
         
+        # The arguments only depend on the template, so each distinct template is rendered once
+        query_templates = df['query'].tolist()
+        unique_templates = list(dict.fromkeys(query_templates))
+        render = partial(_render_one, sample_args=sample_args)
+        if workers is None:
+            workers = default_render_workers(len(unique_templates))
+        if workers > 1:
+            chunksize = max(1, len(unique_templates) // (workers * 4))
+            with Pool(workers) as pool:
+                outcomes = dict(zip(unique_templates, pool.imap(render, unique_templates, chunksize)))
+        else:
+            outcomes = dict(zip(unique_templates, map(render, unique_templates)))
+        
         # Process each query
-        for idx, row in df.iterrows():
-            query_template = row['query']
+        for idx, query_template in enumerate(query_templates):
             print(f"\nProcessing query {idx + 1}/{len(df)}")
             print(f"Template: {query_template[:100]}{'...' if len(query_template) > 100 else ''}")
             
-            try:
-                # Create arguments dictionary for this specific query
-                query_args = create_args_dict_for_query(query_template, sample_args)
-                
-                # Render the query
-                rendered_query = render_template_query(config, query_template, query_args)
-                
-                rendered_queries.append({
-                    'query_id': idx + 1,
-                    'original_template': query_template,
-                    'rendered_query': rendered_query,
-                    'required_args': identify_required_args(query_template),
-                    'status': 'success'
-                })
+            rendered_query, error, required_args, warnings = outcomes[query_template]
+            for warning in warnings:
+                print(warning)
+            
+            if error is None:
+                rendered_queries.append(RenderResult(
+                    query_id=idx + 1,
+                    original_template=query_template,
+                    rendered_query=rendered_query,
+                    required_args=required_args,
+                    status='success',
+                ))
                 
                 successful_renders += 1
                 print("✓ Successfully rendered")
                 
-            except Exception as e:
-                print(f"✗ Error rendering query: {str(e)}")
-                rendered_queries.append({
-                    'query_id': idx + 1,
-                    'original_template': query_template,
-                    'rendered_query': None,
-                    'error': str(e),
-                    'status': 'failed'
-                })
+            else:
+                print(f"✗ Error rendering query: {error}")
+                rendered_queries.append(RenderResult(
+                    query_id=idx + 1,
+                    original_template=query_template,
+                    rendered_query=None,
+                    required_args=None,
+                    status='failed',
+                    error=error,
+                ))
                 failed_renders += 1
         
         # Save results
@@ -312,47 +511,52 @@ def process_queries(csv_file: str, output_file: str = "rendered_queries.sql"):
         raise
 
 
-def save_results(rendered_queries: List[Dict], output_file: str):
+def save_results(rendered_queries: List[RenderResult], output_file: str):
     """
     Saves the rendered queries to both SQL and JSON formats.
     
     Args:
-        rendered_queries: List of query dictionaries
+        rendered_queries: List of render results
         output_file: Base output filename
     """
-    import os
-    
     # Ensure output directory exists
     output_dir = "output"
     os.makedirs(output_dir, exist_ok=True)
     
     # Save as SQL file
     sql_file = os.path.join(output_dir, output_file)
-    with open(sql_file, 'w') as f:
-        f.write("-- Rendered SQL Queries from nostros_query.csv\n")
-        f.write("-- Generated by NOSTROS query translator\n\n")
+    parts = [
+        "-- Rendered SQL Queries from nostros_query.csv\n",
+        "-- Generated by NOSTROS query translator\n\n",
+    ]
+    separator = "-" * 80 + "\n\n"
+    
+    for query_data in rendered_queries:
+        parts.append(f"-- Query ID: {query_data.query_id}\n")
+        parts.append(f"-- Status: {query_data.status}\n")
+        parts.append(f"-- Original Template:\n-- {query_data.original_template}\n")
         
-        for query_data in rendered_queries:
-            f.write(f"-- Query ID: {query_data['query_id']}\n")
-            f.write(f"-- Status: {query_data['status']}\n")
-            f.write(f"-- Original Template:\n-- {query_data['original_template']}\n")
-            
-            if query_data['status'] == 'success':
-                f.write(f"-- Required Arguments: {query_data.get('required_args', {})}\n")
-                rendered_query = query_data['rendered_query']
-                # Only add semicolon if the query doesn't already end with one
-                if not rendered_query.rstrip().endswith(';'):
-                    rendered_query += ';'
-                f.write(f"{rendered_query}\n\n")
-            else:
-                f.write(f"-- Error: {query_data.get('error', 'Unknown error')}\n\n")
-            
-            f.write("-" * 80 + "\n\n")
+        if query_data.status == 'success':
+            parts.append(f"-- Required Arguments: {query_data.required_args}\n")
+            rendered_query = query_data.rendered_query
+            # Only add semicolon if the query doesn't already end with one
+            if not rendered_query.rstrip().endswith(';'):
+                rendered_query += ';'
+            parts.append(f"{rendered_query}\n\n")
+        else:
+            parts.append(f"-- Error: {query_data.error or 'Unknown error'}\n\n")
+        
+        parts.append(separator)
+    
+    # Write the whole file in one call
+    with open(sql_file, 'wb') as f:
+        f.write("".join(parts).encode('utf-8'))
     
     # Save as JSON file for detailed analysis
     json_file = os.path.join(output_dir, output_file.replace('.sql', '.json'))
-    with open(json_file, 'w') as f:
-        json.dump(rendered_queries, f, indent=2)
+    json_data = json.dumps([query_data._asdict() for query_data in rendered_queries], indent=2)
+    with open(json_file, 'wb') as f:
+        f.write(json_data.encode('utf-8'))
     
     print(f"Saved SQL queries to: {sql_file}")
     print(f"Saved detailed results to: {json_file}")
@@ -390,9 +594,28 @@ def test_individual_templates():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Translate query templates into executable SQL.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes used to render templates (default: one per CPU for large inputs)",
+    )
+    parser.add_argument(
+        "--refresh-sample-args",
+        action="store_true",
+        help="Fetch sample arguments from the DB instead of reusing the snapshot in cache/",
+    )
+    cli_args = parser.parse_args()
+    
     print("NOSTROS Query Translator")
     print("=" * 50)
     
     # Process all queries from CSV
     print("\n2. Processing all queries from nostros_query.csv:")
-    process_queries("data/nostros_query.csv", "rendered_queries.sql")
\ No newline at end of file
+    process_queries(
+        "data/nostros_query.csv",
+        "rendered_queries.sql",
+        workers=cli_args.workers,
+        refresh_sample_args=cli_args.refresh_sample_args,
+    )
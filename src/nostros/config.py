@@ -1,6 +1,9 @@
 from os import path as osp
 import os
+import threading
+from contextlib import contextmanager
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 
@@ -71,14 +74,52 @@ REDSHIFT_PARM = {
 
 load_dotenv()
 
-def get_db_connection():
+# Bounds of the shared connection pool used for concurrent DB lookups
+DB_POOL_MIN_CONN = 1
+DB_POOL_MAX_CONN = 16
+
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+
+def _get_db_connection_params():
     db_url = os.getenv("DB_CONNECTION_STRING")
     parsed = urlparse(db_url)
 
-    return psycopg2.connect(
+    return dict(
         dbname=parsed.path[1:],
         user=parsed.username,
         password=parsed.password,
         host=parsed.hostname,
         port=parsed.port,
     )
+
+
+def get_db_connection():
+    return psycopg2.connect(**_get_db_connection_params())
+
+
+def get_db_pool():
+    """Returns the process-wide connection pool, creating it on first use."""
+    global _db_pool
+    with _db_pool_lock:
+        if _db_pool is None:
+            _db_pool = ThreadedConnectionPool(
+                DB_POOL_MIN_CONN, DB_POOL_MAX_CONN, **_get_db_connection_params()
+            )
+        return _db_pool
+
+
+@contextmanager
+def pooled_db_connection():
+    """Borrows a connection from the pool and returns it once the block exits.
+
+    putconn rolls back connections left mid-transaction or in error and discards
+    ones that lost the server, so the next borrower always gets a clean one.
+    """
+    pool = get_db_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
@@ -35,6 +35,10 @@ def render_template_query(config, general_query, args_dict):
         str: Rendered query by replacing argument and template placeholders.
     """
 
+    # Every placeholder starts with "<"; queries without one have nothing to render
+    if "<" not in general_query:
+        return general_query
+
     # Render <SCHEMA> placeholder
     current_query = re.sub(SCHEMA_P, config.SCHEMA, general_query)
 
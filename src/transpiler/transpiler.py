@@ -2,6 +2,12 @@ import sqlglot
 import re
 import os
 
+# DATE_PART_YEAR(<expr>) calls, rewritten to EXTRACT(YEAR FROM <expr>)
+DATE_PART_YEAR_P = re.compile(r'DATE_PART_YEAR\s*\(\s*([^)]+)\s*\)', re.IGNORECASE)
+
+# Matches: JOIN (SELECT ...) <optional whitespace> ON ...
+JOIN_SUBQUERY_P = re.compile(r"JOIN\s*\((SELECT[\s\S]+?)\)\s*(ON\s+[^)]+)", re.IGNORECASE)
+
 def transpile_redshift_to_postgres(redshift_sql: str) -> str:
     """Transpile a single SQL query from Redshift to PostgreSQL."""
     try:
@@ -25,7 +31,7 @@ def transpile_redshift_to_postgres(redshift_sql: str) -> str:
 def preprocess_sql_for_postgres(sql: str) -> str:
     """Preprocess SQL to handle functions that need manual conversion."""
     # Convert DATE_PART_YEAR to EXTRACT(YEAR FROM ...)
-    sql = re.sub(r'DATE_PART_YEAR\s*\(\s*([^)]+)\s*\)', r'EXTRACT(YEAR FROM \1)', sql, flags=re.IGNORECASE)
+    sql = DATE_PART_YEAR_P.sub(r'EXTRACT(YEAR FROM \1)', sql)
     return sql
 
 def postprocess_sql_for_postgres(sql: str) -> str:
@@ -43,9 +49,7 @@ def postprocess_sql_for_postgres(sql: str) -> str:
         alias_counter += 1
         return f"JOIN ({subquery}) AS {alias} {on_clause}"
 
-    # Matches: JOIN (SELECT ...) <optional whitespace> ON ...
-    pattern = r"JOIN\s*\((SELECT[\s\S]+?)\)\s*(ON\s+[^)]+)"
-    sql = re.sub(pattern, add_alias_to_join, sql, flags=re.IGNORECASE)
+    sql = JOIN_SUBQUERY_P.sub(add_alias_to_join, sql)
 
     return sql
 